@@ -1,12 +1,30 @@
+import asyncio
 import time
 import logging
+import functools
+import hashlib
+import itertools
+import os
 import re
 import threading
 import yaml
-import requests
+import diskcache
+import httpx
 from pathlib import Path
 from typing import Optional
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
 DEFAULT_SUPPORTED_EXTENSIONS = {
     '.pdf': 'application/pdf',
     '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
@@ -27,11 +45,62 @@ DEFAULT_SUPPORTED_EXTENSIONS = {
     '.webp': 'image/webp',
 }
 
+PROMPT_VERSION = 1
+LLM_CACHE_EXPIRE_SECONDS = 7 * 86400
+DOC_CACHE_EXPIRE_SECONDS = 30 * 86400
+FAST_TEXT_MIN_CHARS = 500
+FAST_TEXT_MIN_CHARS_PER_PAGE = 50
+FILE_STABLE_INTERVAL_SECONDS = 0.5
+FILE_READY_TIMEOUT_SECONDS = 300
+UPLOAD_CHUNK_SIZE = 64 * 1024
+OLLAMA_MAX_RETRIES = 3
+OLLAMA_RETRY_STATUS_CODES = {502, 503, 504}
+
+_FILENAME_TRANSLATION = str.maketrans({
+    **{chr(c): None for c in [*range(0x20), 0x7F]},
+    **{c: '_' for c in ' /\\?%*:|"<>'},
+})
+_HTML5_FORM_ENCODING = str.maketrans({
+    '"': '%22',
+    '\\': '\\\\',
+    **{chr(c): f'%{c:02X}' for c in range(0x20) if c != 0x1B},
+})
+_ATTEMPT_PATTERN = re.compile(r'_attempt(\d+)$')
+_PDFIUM_LOCK = threading.Lock()
+_LOGGING_CONFIGURED = False
+
+logger = logging.getLogger(__name__)
+
+
+def _setup_logging(level: str, log_file: Path):
+    global _LOGGING_CONFIGURED
+
+    logger.setLevel(getattr(logging, level))
+    if _LOGGING_CONFIGURED:
+        return
+
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    file_handler.stream.reconfigure(line_buffering=True)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    logger.handlers.clear()
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    _LOGGING_CONFIGURED = True
+
+
+@functools.lru_cache(maxsize=1)
+def _load_yaml(config_path: str, mtime: float) -> dict:
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 
 class Config:
     def __init__(self, config_path: str = "config.yaml"):
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        self.config = _load_yaml(config_path, os.path.getmtime(config_path))
 
         self.watch_dir = Path(self.config['watch_directory'])
         self.processed_dir = Path(self.config.get('processed_directory', self.watch_dir / "processed"))
@@ -51,23 +120,14 @@ class Config:
 
         self.retry_interval = self.config['retry']['interval_seconds']
         self.max_attempts = self.config['retry']['max_attempts']
-        self.polling_interval = self.config.get('polling', {}).get('interval_seconds', 5)
+        self.polling_interval = self.config.get('polling', {}).get('interval_seconds', 60)
+        self.concurrency = self.config.get('processing', {}).get('concurrency', 4)
+        self.fast_text_extraction = self.config.get('fast_text_extraction', False)
+        self.cache_dir = Path(self.config.get('cache', {}).get('directory', ".pdf_renamer_cache"))
 
         self._load_supported_extensions()
 
-        log_file = self.watch_dir / "pdf_renamer.log"
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        file_handler.stream.reconfigure(line_buffering=True)
-
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(getattr(logging, self.config['logging']['level']))
-        self.logger.handlers.clear()
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        _setup_logging(self.config['logging']['level'], self.watch_dir / "pdf_renamer.log")
 
     def _load_supported_extensions(self):
         configured_extensions = self.config.get('supported_extensions')
@@ -90,157 +150,307 @@ class Config:
         else:
             self.supported_extensions = DEFAULT_SUPPORTED_EXTENSIONS.copy()
 
+        self.supported_extensions_noext = {ext.lstrip('.') for ext in self.supported_extensions}
+
     def is_supported_file(self, file_path: Path) -> bool:
         return file_path.suffix.lower() in self.supported_extensions
 
+    def is_supported_name(self, name: str) -> bool:
+        stem, _, ext = name.rpartition('.')
+        return bool(stem) and ext.lower() in self.supported_extensions_noext
+
+    def scan_supported_files(self, directory: Path) -> list[Path]:
+        with os.scandir(directory) as it:
+            return [Path(entry.path) for entry in it
+                    if entry.is_file() and self.is_supported_name(entry.name)]
+
     def get_mime_type(self, file_path: Path) -> str:
         return self.supported_extensions.get(file_path.suffix.lower(), 'application/octet-stream')
 
 
+def _hash_file(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _move_to_unique_path(src: Path, directory: Path, stem: str, suffix: str) -> Path:
+    for counter in itertools.count():
+        candidate = directory / (f"{stem}{suffix}" if counter == 0 else f"{stem}_{counter}{suffix}")
+        try:
+            fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            continue
+        os.close(fd)
+
+        try:
+            os.replace(src, candidate)
+        except OSError:
+            candidate.unlink(missing_ok=True)
+            raise
+        return candidate
+
+
+def _multipart_envelope(boundary: str, data: dict, filename: str, mime_type: str) -> tuple[bytes, bytes]:
+    head = bytearray()
+    for name, value in data.items():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, bool):
+                item = 'true' if item else 'false'
+            item = str(item).translate(_HTML5_FORM_ENCODING)
+            head += f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{item}\r\n'.encode('utf-8')
+
+    quoted_filename = filename.translate(_HTML5_FORM_ENCODING)
+    head += (f'--{boundary}\r\nContent-Disposition: form-data; name="files"; filename="{quoted_filename}"\r\n'
+             f'Content-Type: {mime_type}\r\n\r\n').encode('utf-8')
+    tail = f'\r\n--{boundary}--\r\n'.encode('ascii')
+    return bytes(head), tail
+
+
+async def _iter_upload(f, head: bytes, tail: bytes):
+    yield head
+    while chunk := await asyncio.to_thread(f.read, UPLOAD_CHUNK_SIZE):
+        yield chunk
+    yield tail
+
+
 class DocumentProcessor:
     def __init__(self, config: Config):
         self.config = config
-        self.logger = config.logger
+
+        self.docling_url = f"http://{config.docling_host}:{config.docling_port}/v1/convert/file"
+        self.ollama_url = f"http://{config.ollama_host}:{config.ollama_port}/api/generate"
+        self._docling_base_data = {
+            'from_formats': ["docx", "pptx", "html", "image", "pdf", "asciidoc", "md", "xlsx"],
+            'to_formats': [config.docling_format],
+            'do_ocr': True,
+            'image_export_mode': config.docling_image_export_mode,
+            'ocr_engine': config.docling_ocr_engine
+        }
+
+        # The transport only retries failed connects, so streamed uploads are never sent twice.
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        self.client = httpx.AsyncClient(timeout=600, limits=limits,
+                                        transport=httpx.AsyncHTTPTransport(retries=3, limits=limits))
+        self.slots = asyncio.Semaphore(config.concurrency)
+
+        self.llm_cache = diskcache.Cache(str(config.cache_dir / "llm"))
+        self.doc_cache = diskcache.Cache(str(config.cache_dir / "documents"))
         
-    def extract_text_from_document(self, doc_path: Path) -> Optional[str]:
+    async def _cache_get(self, cache: diskcache.Cache, key: str) -> Optional[str]:
+        try:
+            return await asyncio.to_thread(cache.get, key)
+        except Exception as e:
+            logger.warning(f"Cache-Zugriff fehlgeschlagen, wird ignoriert: {e}")
+            return None
+
+    async def _cache_set(self, cache: diskcache.Cache, key: str, value: str, expire: int):
+        try:
+            await asyncio.to_thread(cache.set, key, value, expire=expire)
+        except Exception as e:
+            logger.warning(f"Cache-Zugriff fehlgeschlagen, wird ignoriert: {e}")
+
+    async def extract_text_from_document(self, doc_path: Path) -> Optional[str]:
         try:
-            docling_url = f"http://{self.config.docling_host}:{self.config.docling_port}/v1/convert/file"
-            
             mime_type = self.config.get_mime_type(doc_path)
             
-            force_ocr = doc_path.suffix.lower() == '.pdf' and doc_path.name.startswith("Xerox Scan_")
+            is_pdf = doc_path.suffix.lower() == '.pdf'
+            force_ocr = is_pdf and doc_path.name.startswith("Xerox Scan_")
 
-            text = self._call_docling(docling_url, doc_path, mime_type, force_ocr)
+            if is_pdf and not force_ocr and self.config.fast_text_extraction and pdfium is not None:
+                text = await asyncio.to_thread(self._extract_pdf_text_layer, doc_path)
+                if text:
+                    logger.info(f"Textebene aus PDF gelesen, docling übersprungen: {doc_path.name}")
+                    return text
+
+            text = await self._call_docling(doc_path, mime_type, force_ocr)
             
             if not text and not force_ocr:
-                self.logger.info(f"Kein Text extrahiert, versuche erneut mit force_ocr=True: {doc_path.name}")
-                text = self._call_docling(docling_url, doc_path, mime_type, force_ocr=True)
+                logger.info(f"Kein Text extrahiert, versuche erneut mit force_ocr=True: {doc_path.name}")
+                text = await self._call_docling(doc_path, mime_type, force_ocr=True)
             
             return text
 
-        except requests.exceptions.HTTPError as e:
-            self.logger.error(f"Fehler beim Extrahieren von Text aus {doc_path}: {e} - Response: {e.response.text}")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Fehler beim Extrahieren von Text aus {doc_path}: {e} - Response: {e.response.text}")
             return None
         except Exception as e:
-            self.logger.error(f"Fehler beim Extrahieren von Text aus {doc_path}: {e}")
+            logger.error(f"Fehler beim Extrahieren von Text aus {doc_path}: {e}")
             return None
 
-    def _call_docling(self, docling_url: str, doc_path: Path, mime_type: str, force_ocr: bool) -> Optional[str]:
-        with open(doc_path, 'rb') as f:
-            files = {'files': (doc_path.name, f, mime_type)}
-            data = {
-                'from_formats': ["docx", "pptx", "html", "image", "pdf", "asciidoc", "md", "xlsx"],
-                'to_formats': [self.config.docling_format],
-                'do_ocr': True,
-                'force_ocr': force_ocr,
-                'image_export_mode': self.config.docling_image_export_mode,
-                'ocr_engine': self.config.docling_ocr_engine
-            }
+    def _extract_pdf_text_layer(self, doc_path: Path) -> Optional[str]:
+        try:
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(doc_path)
+                try:
+                    page_count = len(pdf)
+                    text = '\n'.join(page.get_textpage().get_text_range() for page in pdf)
+                finally:
+                    pdf.close()
+        except Exception as e:
+            logger.debug(f"Textebene konnte nicht gelesen werden: {doc_path.name}: {e}")
+            return None
 
-            response = requests.post(docling_url, files=files, data=data, timeout=600)
-            response.raise_for_status()
+        if len(text.strip()) < max(FAST_TEXT_MIN_CHARS, page_count * FAST_TEXT_MIN_CHARS_PER_PAGE):
+            return None
+        return text
 
-            result = response.json()
+    async def _call_docling(self, doc_path: Path, mime_type: str, force_ocr: bool) -> Optional[str]:
+        boundary = os.urandom(16).hex()
+        data = {**self._docling_base_data, 'force_ocr': force_ocr}
+        head, tail = _multipart_envelope(boundary, data, doc_path.name, mime_type)
 
-            doc = result.get('document', {})
-            if self.config.docling_format == 'md':
-                text = doc.get('md_content', '')
-            elif self.config.docling_format == 'text':
-                text = doc.get('text_content', '')
-            else:
-                text = doc.get('md_content', doc.get('text_content', ''))
-            
-            return text if text and text.strip() else None
+        # The body is streamed from a worker thread so large uploads do not block the event loop.
+        f = await asyncio.to_thread(open, doc_path, 'rb')
+        try:
+            size = (await asyncio.to_thread(os.fstat, f.fileno())).st_size
+            headers = {
+                'Content-Type': f'multipart/form-data; boundary={boundary}',
+                'Content-Length': str(len(head) + size + len(tail)),
+            }
+            response = await self.client.post(self.docling_url, content=_iter_upload(f, head, tail), headers=headers)
+        finally:
+            f.close()
+        response.raise_for_status()
+
+        result = response.json()
+
+        doc = result.get('document', {})
+        if self.config.docling_format == 'md':
+            text = doc.get('md_content', '')
+        elif self.config.docling_format == 'text':
+            text = doc.get('text_content', '')
+        else:
+            text = doc.get('md_content', doc.get('text_content', ''))
+
+        return text if text and text.strip() else None
     
-    def generate_summary(self, text: str) -> Optional[str]:
+    async def generate_summary(self, text: str) -> Optional[str]:
         try:
-            ollama_url = f"http://{self.config.ollama_host}:{self.config.ollama_port}/api/generate"
-            
+            prompt = f"{self.config.ollama_prompt}\n\n{text[:4000]}"
+
+            cache_key = hashlib.sha256(f"{PROMPT_VERSION}|{self.config.ollama_model}|{prompt}".encode('utf-8')).hexdigest()
+            cached = await self._cache_get(self.llm_cache, cache_key)
+            if cached:
+                logger.info(f"Zusammenfassung aus Cache verwendet: {cached}")
+                return cached
+
             payload = {
                 "model": self.config.ollama_model,
-                "prompt": f"{self.config.ollama_prompt}\n\n{text[:4000]}",
+                "prompt": prompt,
                 "stream": False
             }
             
-            response = requests.post(ollama_url, json=payload, timeout=600)
+            for attempt in range(OLLAMA_MAX_RETRIES + 1):
+                response = await self.client.post(self.ollama_url, json=payload)
+                if response.status_code not in OLLAMA_RETRY_STATUS_CODES or attempt == OLLAMA_MAX_RETRIES:
+                    break
+                await asyncio.sleep(0.5 * 2 ** attempt)
             response.raise_for_status()
             
             result = response.json()
             summary = result.get('response', '').strip()
             
-            summary = re.sub(r'[\x00-\x1F\x7F]', '', summary)
-            summary = summary.replace(' ', '_')
-            summary = re.sub(r'[/\\?%*:|"<>]', '_', summary)
-            summary = summary[:150]
-            
-            return summary if summary else None
+            summary = summary.translate(_FILENAME_TRANSLATION)[:150]
+
+            if not summary:
+                return None
+
+            await self._cache_set(self.llm_cache, cache_key, summary, LLM_CACHE_EXPIRE_SECONDS)
+            return summary
             
-        except requests.exceptions.HTTPError as e:
-            self.logger.error(f"Fehler beim Generieren der Zusammenfassung: {e} - Response: {e.response.text}")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Fehler beim Generieren der Zusammenfassung: {e} - Response: {e.response.text}")
             return None
         except Exception as e:
-            self.logger.error(f"Fehler beim Generieren der Zusammenfassung: {e}")
+            logger.error(f"Fehler beim Generieren der Zusammenfassung: {e}")
             return None
     
-    def process_document(self, doc_path: Path) -> bool:
+    async def _wait_until_ready(self, doc_path: Path) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + FILE_READY_TIMEOUT_SECONDS
         try:
-            self.logger.info(f"Verarbeite Dokument: {doc_path.name}")
-            
-            text = self.extract_text_from_document(doc_path)
-            if not text:
-                raise Exception("Kein Text extrahiert")
-            
-            summary = self.generate_summary(text)
-            if not summary:
-                raise Exception("Keine Zusammenfassung generiert")
-            
-            new_filename = f"{summary}{doc_path.suffix}"
-            new_path = self.config.processed_dir / new_filename
-            
-            counter = 1
-            while new_path.exists():
-                new_filename = f"{summary}_{counter}{doc_path.suffix}"
-                new_path = self.config.processed_dir / new_filename
-                counter += 1
+            size = (await asyncio.to_thread(doc_path.stat)).st_size
+            while True:
+                await asyncio.sleep(FILE_STABLE_INTERVAL_SECONDS)
+                new_size = (await asyncio.to_thread(doc_path.stat)).st_size
+                if new_size == size and new_size > 0:
+                    return True
+                if loop.time() >= deadline:
+                    if new_size == size == 0:
+                        return True
+                    logger.warning(f"Dokument wird noch geschrieben, erneuter Versuch beim nächsten Durchlauf: {doc_path.name}")
+                    return False
+                size = new_size
+        except FileNotFoundError:
+            return False
+
+    async def process_document(self, doc_path: Path) -> bool:
+        if not await self._wait_until_ready(doc_path):
+            return False
+
+        async with self.slots:
+            if not await asyncio.to_thread(doc_path.exists):
+                return False
+            return await self._process_document(doc_path)
+
+    async def _process_document(self, doc_path: Path) -> bool:
+        try:
+            logger.info(f"Verarbeite Dokument: {doc_path.name}")
+
+            if (await asyncio.to_thread(doc_path.stat)).st_size == 0:
+                raise Exception("Dokument ist leer")
+
+            doc_hash = await asyncio.to_thread(_hash_file, doc_path)
+            cache_key = hashlib.sha256(
+                f"{PROMPT_VERSION}|{self.config.ollama_model}|{self.config.ollama_prompt}|{doc_hash}".encode('utf-8')
+            ).hexdigest()
+            summary = await self._cache_get(self.doc_cache, cache_key)
+
+            if summary:
+                logger.info(f"Dokument bereits bekannt, verwende Zusammenfassung aus Cache: {doc_path.name}")
+            else:
+                text = await self.extract_text_from_document(doc_path)
+                if not text:
+                    raise Exception("Kein Text extrahiert")
+
+                summary = await self.generate_summary(text)
+                if not summary:
+                    raise Exception("Keine Zusammenfassung generiert")
+
+                await self._cache_set(self.doc_cache, cache_key, summary, DOC_CACHE_EXPIRE_SECONDS)
             
-            doc_path.rename(new_path)
-            self.logger.info(f"Dokument erfolgreich verarbeitet: {doc_path.name} -> {new_filename}")
+            new_path = _move_to_unique_path(doc_path, self.config.processed_dir, summary, doc_path.suffix)
+            logger.info(f"Dokument erfolgreich verarbeitet: {doc_path.name} -> {new_path.name}")
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Fehler beim Verarbeiten von {doc_path.name}: {e}")
+            logger.error(f"Fehler beim Verarbeiten von {doc_path.name}: {e}")
             
-            if doc_path.exists():
+            if await asyncio.to_thread(doc_path.exists):
                 try:
-                    error_path = self.config.error_dir / doc_path.name
-                    counter = 1
-                    while error_path.exists():
-                        error_path = self.config.error_dir / f"{doc_path.stem}_{counter}{doc_path.suffix}"
-                        counter += 1
-
-                    doc_path.rename(error_path)
-                    self.logger.error(f"Dokument in error verschoben: {doc_path.name}")
+                    _move_to_unique_path(doc_path, self.config.error_dir, doc_path.stem, doc_path.suffix)
+                    logger.error(f"Dokument in error verschoben: {doc_path.name}")
                 except OSError as rename_error:
-                    self.logger.error(f"Konnte Datei nicht verschieben: {rename_error}")
+                    logger.error(f"Konnte Datei nicht verschieben: {rename_error}")
             
             return False
 
 
-def retry_error_files(processor: DocumentProcessor):
-    attempt_pattern = re.compile(r'_attempt(\d+)$')
-
+async def retry_error_files(processor: DocumentProcessor):
     while True:
-        error_files = [f for f in processor.config.error_dir.iterdir()
-                       if processor.config.is_supported_file(f)]
+        error_files = processor.config.scan_supported_files(processor.config.error_dir)
 
         if error_files:
-            processor.logger.info(f"Versuche {len(error_files)} Dokumente aus error-Verzeichnis erneut zu verarbeiten")
+            logger.info(f"Versuche {len(error_files)} Dokumente aus error-Verzeichnis erneut zu verarbeiten")
 
             for doc_path in error_files:
                 try:
                     stem = doc_path.stem
-                    match = attempt_pattern.search(stem)
+                    match = _ATTEMPT_PATTERN.search(stem)
 
                     if match:
                         attempts = int(match.group(1))
@@ -250,33 +460,122 @@ def retry_error_files(processor: DocumentProcessor):
                         base_stem = stem
 
                     if attempts >= processor.config.max_attempts:
-                        processor.logger.warning(f"Max. Versuche erreicht für {doc_path.name}, wird nicht erneut verarbeitet")
+                        logger.warning(f"Max. Versuche erreicht für {doc_path.name}, wird nicht erneut verarbeitet")
                         continue
 
                     new_stem = f"{base_stem}_attempt{attempts + 1}"
-                    watch_path = processor.config.watch_dir / f"{new_stem}{doc_path.suffix}"
+                    watch_path = _move_to_unique_path(doc_path, processor.config.watch_dir, new_stem, doc_path.suffix)
+                    logger.info(f"Dokument aus error zurück in watch verschoben: {doc_path.name} -> {watch_path.name} (Versuch {attempts + 1})")
+
+                except Exception as e:
+                    logger.error(f"Fehler beim Verschieben von {doc_path.name}: {e}")
 
-                    counter = 1
-                    while watch_path.exists():
-                        watch_path = processor.config.watch_dir / f"{new_stem}_{counter}{doc_path.suffix}"
-                        counter += 1
+        await asyncio.sleep(processor.config.retry_interval)
 
-                    doc_path.rename(watch_path)
-                    processor.logger.info(f"Dokument aus error zurück in watch verschoben: {doc_path.name} -> {watch_path.name} (Versuch {attempts + 1})")
 
-                except Exception as e:
-                    processor.logger.error(f"Fehler beim Verschieben von {doc_path.name}: {e}")
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class DocumentDispatcher:
+    def __init__(self, processor: DocumentProcessor):
+        self.processor = processor
+        self.in_flight: dict[Path, asyncio.Task] = {}
+        self.slots = asyncio.Semaphore(processor.config.concurrency * 2)
+
+    async def submit(self, doc_path: Path):
+        if doc_path in self.in_flight:
+            return
+
+        await self.slots.acquire()
+        task = asyncio.create_task(self._process(doc_path))
+        self.in_flight[doc_path] = task
+        task.add_done_callback(lambda _: self._release(doc_path))
 
-        time.sleep(processor.config.retry_interval)
+    async def submit_batch(self, doc_paths: list[Path]):
+        sizes = await asyncio.to_thread(lambda: {doc_path: _file_size(doc_path) for doc_path in doc_paths})
+        for doc_path in sorted(sizes, key=sizes.get, reverse=True):
+            await self.submit(doc_path)
 
+    async def _process(self, doc_path: Path) -> bool:
+        try:
+            return await self.processor.process_document(doc_path)
+        except Exception as e:
+            logger.error(f"Fehler bei {doc_path.name}: {e}")
+            return False
+
+    def _release(self, doc_path: Path):
+        self.in_flight.pop(doc_path, None)
+        self.slots.release()
+
+
+def poll_directory(processor: DocumentProcessor, pending: asyncio.Queue):
+    for doc_path in processor.config.scan_supported_files(processor.config.watch_dir):
+        pending.put_nowait(doc_path)
+
+
+async def rescan_directory(processor: DocumentProcessor, pending: asyncio.Queue):
+    while True:
+        await asyncio.sleep(processor.config.polling_interval)
+        try:
+            poll_directory(processor, pending)
+        except Exception as e:
+            logger.error(f"Fehler beim Durchsuchen von {processor.config.watch_dir}: {e}")
+
+
+class WatchDirectoryHandler(FileSystemEventHandler):
+    def __init__(self, config: Config, loop: asyncio.AbstractEventLoop, pending: asyncio.Queue):
+        self.config = config
+        self.loop = loop
+        self.pending = pending
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._enqueue(Path(event.src_path))
 
-def poll_directory(processor: DocumentProcessor):
-    for f in processor.config.watch_dir.iterdir():
-        if processor.config.is_supported_file(f):
-            try:
-                processor.process_document(f)
-            except Exception as e:
-                processor.logger.error(f"Fehler bei {f.name}: {e}")
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._enqueue(Path(event.dest_path))
+
+    def _enqueue(self, doc_path: Path):
+        if doc_path.parent == self.config.watch_dir and self.config.is_supported_file(doc_path):
+            self.loop.call_soon_threadsafe(self.pending.put_nowait, doc_path)
+
+
+async def amain(config: Config):
+    processor = DocumentProcessor(config)
+    dispatcher = DocumentDispatcher(processor)
+    pending = asyncio.Queue()
+
+    observer = Observer()
+    observer.schedule(WatchDirectoryHandler(config, asyncio.get_running_loop(), pending),
+                      str(config.watch_dir), recursive=False)
+    observer.start()
+
+    background_tasks = [
+        asyncio.create_task(retry_error_files(processor)),
+        asyncio.create_task(rescan_directory(processor, pending)),
+    ]
+
+    poll_directory(processor, pending)
+
+    try:
+        while True:
+            batch = [await pending.get()]
+            while not pending.empty():
+                batch.append(pending.get_nowait())
+            await dispatcher.submit_batch(batch)
+    finally:
+        observer.stop()
+        observer.join()
+        for task in background_tasks:
+            task.cancel()
+        await processor.client.aclose()
+        processor.llm_cache.close()
+        processor.doc_cache.close()
 
 
 def main():
@@ -287,21 +586,17 @@ def main():
     config.processed_dir.mkdir(parents=True, exist_ok=True)
     config.error_dir.mkdir(parents=True, exist_ok=True)
 
-    processor = DocumentProcessor(config)
-
     supported_ext_list = ', '.join(config.supported_extensions.keys())
-    config.logger.info(f"Dokument-Überwachung gestartet: {config.watch_dir} (Polling-Intervall: {config.polling_interval}s)")
-    config.logger.info(f"Unterstützte Dateitypen: {supported_ext_list}")
-
-    retry_thread = threading.Thread(target=retry_error_files, args=(processor,), daemon=True)
-    retry_thread.start()
+    logger.info(f"Dokument-Überwachung gestartet: {config.watch_dir} (Rescan-Intervall: {config.polling_interval}s)")
+    logger.info(f"Unterstützte Dateitypen: {supported_ext_list}")
+    logger.info(f"Parallele Verarbeitung: {config.concurrency} Dokumente")
+    if config.fast_text_extraction and pdfium is None:
+        logger.warning("fast_text_extraction ist aktiviert, aber pypdfium2 ist nicht installiert")
 
     try:
-        while True:
-            poll_directory(processor)
-            time.sleep(config.polling_interval)
+        asyncio.run(amain(config))
     except KeyboardInterrupt:
-        config.logger.info("Dokument-Überwachung beendet")
+        logger.info("Dokument-Überwachung beendet")
         raise
 
 
@@ -312,5 +607,5 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             break
         except Exception as e:
-            logging.error(f"Unerwarteter Fehler, Neustart in 10 Sekunden: {e}")
+            logger.error(f"Unerwarteter Fehler, Neustart in 10 Sekunden: {e}")
             time.sleep(10)
\ No newline at end of file
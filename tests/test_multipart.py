@@ -0,0 +1,54 @@
+from email.parser import BytesParser
+from email.policy import HTTP
+
+from pdf_renamer import _multipart_envelope
+
+BOUNDARY = "0123456789abcdef0123456789abcdef"
+
+
+def _parse(data: dict, filename: str, payload: bytes):
+    head, tail = _multipart_envelope(BOUNDARY, data, filename, "application/pdf")
+    raw = (f"Content-Type: multipart/form-data; boundary={BOUNDARY}\r\n\r\n".encode("ascii")
+           + head + payload + tail)
+    return list(BytesParser(policy=HTTP).parsebytes(raw).iter_parts())
+
+
+def test_fields_and_file_round_trip():
+    data = {'from_formats': ["pdf", "docx"], 'do_ocr': True, 'force_ocr': False, 'ocr_engine': "easyocr"}
+    payload = b"%PDF-1.4\r\n--not-a-boundary\r\n\x00\xff"
+
+    parts = _parse(data, "Rechnung Bäckerei.pdf", payload)
+
+    fields = [(p.get_param('name', header='content-disposition'), p.get_payload(decode=True)) for p in parts[:-1]]
+    assert fields == [
+        ('from_formats', b"pdf"),
+        ('from_formats', b"docx"),
+        ('do_ocr', b"true"),
+        ('force_ocr', b"false"),
+        ('ocr_engine', b"easyocr"),
+    ]
+
+    file_part = parts[-1]
+    assert file_part.get_param('name', header='content-disposition') == "files"
+    assert file_part.get_filename() == "Rechnung Bäckerei.pdf"
+    assert file_part.get_content_type() == "application/pdf"
+    assert file_part.get_payload(decode=True) == payload
+
+
+def test_filename_control_characters_and_quotes_are_escaped():
+    head, _ = _multipart_envelope(BOUNDARY, {}, 'a"b\\c\r\nContent-Type: text/html\x1f.pdf', "application/pdf")
+
+    disposition = head.split(b"\r\n")[1]
+    assert disposition == (b'Content-Disposition: form-data; name="files"; '
+                           b'filename="a%22b\\\\c%0D%0AContent-Type: text/html%1F.pdf"')
+
+    parts = _parse({}, 'scan\r\n.pdf', b"data")
+    assert len(parts) == 1
+    assert parts[0].get_filename() == "scan%0D%0A.pdf"
+    assert parts[0].get_payload(decode=True) == b"data"
+
+
+def test_field_values_are_escaped():
+    parts = _parse({'ocr_engine': "easy\r\nocr"}, "x.pdf", b"data")
+
+    assert parts[0].get_payload(decode=True) == b"easy%0D%0Aocr"